@@ -1,20 +1,51 @@
 
 import chess
 import chess.pgn
+import chess.polyglot
+import heapq
 import random
 import time
 import numpy as np
+from collections import OrderedDict
 from typing import Dict, List, Tuple, Optional, Set, Union
 from utils import logger
 
+# Transposition table entry flags
+TT_EXACT = 0
+TT_LOWERBOUND = 1
+TT_UPPERBOUND = 2
+
+# Integer stand-in for infinity: evaluations are pure ints (centipawn
+# scale), which keeps the search free of float boxing
+INF_SCORE = 10 ** 9
+
 class ChessAI:
     """Simple chess AI for move suggestions and evaluations"""
-    
+
     def __init__(self, difficulty: int = 5):
         """Initialize AI with difficulty level (1-10)"""
         self.difficulty = max(1, min(10, difficulty))
         logger.info(f"Chess AI initialized with difficulty {self.difficulty}")
-        
+
+        # Transposition table: zobrist hash -> (depth, value, flag).
+        # Cleared per search so it never outgrows a single move's tree.
+        self.transposition_table = {}
+
+        # Incremental material/pawn-table score maintained by _push/_pop
+        # during a search; None when no search is running
+        self._incremental_base = None
+        self._eval_deltas = []
+
+        # Leaf evaluation cache: zobrist hash -> score, FIFO-capped
+        self._eval_cache = {}
+        self._eval_cache_max = 100_000
+
+        # Quiet-move ordering state, reset per search: the last two quiet
+        # moves that caused a cutoff at each ply, and a from/to score
+        # table bumped on every quiet cutoff
+        self._killers = {}  # ply -> (move, previous move)
+        self._history = [[0] * 64 for _ in range(64)]
+
         # Piece values for basic evaluation
         self.piece_values = {
             chess.PAWN: 100,
@@ -40,107 +71,396 @@ class ChessAI:
         # Other piece position tables would be defined here
         # Simplified for brevity
     
-    def evaluate_board(self, board: chess.Board) -> float:
+    def _static_base(self, board: chess.Board) -> int:
+        """Material and pawn-table score computed from the piece bitboards"""
+        score = 0
+        for piece_type, value in self.piece_values.items():
+            score += value * (board.pieces_mask(piece_type, chess.WHITE).bit_count()
+                              - board.pieces_mask(piece_type, chess.BLACK).bit_count())
+
+        # Pawn position values (only pawns have a table here)
+        table = self.pawn_table
+        for square in chess.scan_forward(board.pieces_mask(chess.PAWN, chess.WHITE)):
+            score += table[square]
+        for square in chess.scan_forward(board.pieces_mask(chess.PAWN, chess.BLACK)):
+            score -= table[63 - square]
+        return score
+
+    def _push(self, board: chess.Board, move: chess.Move):
+        """Push a move, updating the incremental base score by its delta"""
+        delta = 0
+        sign = 1 if board.turn else -1
+        table = self.pawn_table
+
+        # A captured piece's value (and pawn-table bonus) leaves the board;
+        # removing an enemy piece moves the score in the mover's favor
+        if board.is_capture(move):
+            if board.is_en_passant(move):
+                victim_sq = move.to_square + (-8 if board.turn else 8)
+                victim_type = chess.PAWN
+            else:
+                victim_sq = move.to_square
+                victim_type = board.piece_at(victim_sq).piece_type
+            victim_value = self.piece_values[victim_type]
+            if victim_type == chess.PAWN:
+                victim_value += table[victim_sq if not board.turn else 63 - victim_sq]
+            delta += sign * victim_value
+
+        if move.promotion:
+            from_idx = move.from_square if board.turn else 63 - move.from_square
+            delta -= sign * (self.piece_values[chess.PAWN] + table[from_idx])
+            delta += sign * self.piece_values[move.promotion]
+        else:
+            moved = board.piece_at(move.from_square)
+            if moved is not None and moved.piece_type == chess.PAWN:
+                from_idx = move.from_square if board.turn else 63 - move.from_square
+                to_idx = move.to_square if board.turn else 63 - move.to_square
+                delta += sign * (table[to_idx] - table[from_idx])
+
+        self._incremental_base += delta
+        self._eval_deltas.append(delta)
+        board.push(move)
+
+    def _pop(self, board: chess.Board):
+        """Pop a move, undoing its incremental score delta"""
+        board.pop()
+        self._incremental_base -= self._eval_deltas.pop()
+
+    def evaluate_board(self, board: chess.Board) -> int:
         """Evaluate the current board position from white's perspective"""
-        if board.is_checkmate():
-            # If checkmate, return a high value (positive if opponent is checkmated)
-            return -10000 if board.turn else 10000
-            
-        if board.is_stalemate() or board.is_insufficient_material():
+        # Identical leaves are reached via transposed move orders both
+        # within a search and across suggest/analyze calls
+        key = chess.polyglot.zobrist_hash(board)
+        cached = self._eval_cache.get(key)
+        if cached is not None:
+            return cached
+
+        score = self._evaluate_board_uncached(board)
+        if len(self._eval_cache) >= self._eval_cache_max:
+            # FIFO eviction keeps the dict bounded without LRU bookkeeping
+            self._eval_cache.pop(next(iter(self._eval_cache)))
+        self._eval_cache[key] = score
+        return score
+
+    def _evaluate_board_uncached(self, board: chess.Board) -> int:
+        """Compute the evaluation for a position not in the cache"""
+        # One legal-move probe replaces the separate checkmate and
+        # stalemate tests, which each generate moves themselves
+        if next(iter(board.legal_moves), None) is None:
+            if board.is_check():
+                # Checkmate: high value, positive if black is mated
+                return -10000 if board.turn else 10000
+            return 0  # Stalemate
+
+        if board.is_insufficient_material():
             return 0  # Draw
-        
-        # Basic material count
-        eval_score = 0
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece:
-                value = self.piece_values[piece.piece_type]
-                
-                # Add position value based on piece position tables
-                if piece.piece_type == chess.PAWN:
-                    sq_idx = square if piece.color else 63 - square
-                    value += self.pawn_table[sq_idx]
-                
-                # Other piece-specific position values would be applied here
-                
-                eval_score += value if piece.color else -value
-        
-        # Mobility (number of legal moves)
-        mobility = len(list(board.legal_moves))
-        eval_score += mobility * 0.1 if board.turn else -mobility * 0.1
-        
-        # Simple king safety
+
+        # Material and pawn placement: incrementally maintained inside a
+        # search, recomputed from bitboards for standalone calls
+        if self._incremental_base is not None:
+            eval_score = self._incremental_base
+        else:
+            eval_score = self._static_base(board)
+
+        # Mobility via attack maps: a few bitboard popcounts per side
+        # instead of full legal-move generation at every leaf
+        white_mobility = sum(board.attacks_mask(square).bit_count()
+                             for square in chess.scan_forward(board.occupied_co[chess.WHITE]))
+        black_mobility = sum(board.attacks_mask(square).bit_count()
+                             for square in chess.scan_forward(board.occupied_co[chess.BLACK]))
+        eval_score += (white_mobility - black_mobility) // 10
+
+        # Simple king safety: attackers_mask resolves attacks through the
+        # precomputed knight/king/pawn tables and magic bitboards, so the
+        # check is a handful of integer ops with no list built
         king_square = board.king(chess.WHITE)
-        if king_square:
-            if len(list(board.attackers(chess.BLACK, king_square))) > 0:
-                eval_score -= 50
-        
+        if king_square is not None and board.attackers_mask(chess.BLACK, king_square):
+            eval_score -= 50
+
         king_square = board.king(chess.BLACK)
-        if king_square:
-            if len(list(board.attackers(chess.WHITE, king_square))) > 0:
-                eval_score += 50
-        
+        if king_square is not None and board.attackers_mask(chess.WHITE, king_square):
+            eval_score += 50
+
         return eval_score
 
     def get_best_move(self, board: chess.Board) -> Optional[chess.Move]:
         """Find a good move based on AI difficulty level"""
         if board.is_game_over():
             return None
-            
-        legal_moves = list(board.legal_moves)
-        if not legal_moves:
-            return None
-            
-        # At lower difficulties, occasionally make random moves
+
+        # At lower difficulties, occasionally make random moves; the move
+        # list is only materialized on the paths that pick one at random
         if random.random() < (1.0 - self.difficulty / 10):
-            return random.choice(legal_moves)
-        
-        # Simple minimax with limited depth based on difficulty
-        depth = max(1, min(3, self.difficulty // 3))
+            return random.choice(list(board.legal_moves))
+
+        # Iteratively deepen to the difficulty-based target depth. Each
+        # iteration seeds the next: its best move is tried first and its
+        # score centers a narrow aspiration window, while the shared
+        # transposition table carries bounds across depths.
+        self.transposition_table.clear()
+        self._killers.clear()
+        self._history = [[0] * 64 for _ in range(64)]
+        target_depth = max(1, min(3, self.difficulty // 3))
+        window = 50  # Half a pawn either side of the previous score
+
+        # Seed the incremental evaluation for this search; _push/_pop keep
+        # it in sync so leaves never rescan the board for material
+        self._incremental_base = self._static_base(board)
+        self._eval_deltas.clear()
+
         best_move = None
-        best_score = float('-inf') if board.turn else float('inf')
-        
-        for move in legal_moves:
-            board.push(move)
-            score = self._minimax(board, depth - 1, float('-inf'), float('inf'), not board.turn)
-            board.pop()
-            
-            if board.turn and score > best_score:
-                best_score = score
-                best_move = move
-            elif not board.turn and score < best_score:
-                best_score = score
-                best_move = move
-        
-        return best_move or random.choice(legal_moves)  # Fallback to random if needed
+        best_score = 0
+        try:
+            for depth in range(1, target_depth + 1):
+                if best_move is None:
+                    alpha, beta = -INF_SCORE, INF_SCORE
+                else:
+                    alpha, beta = best_score - window, best_score + window
+
+                score, move = self._search_root(board, depth, alpha, beta, best_move)
+                if score <= alpha or score >= beta:
+                    # Fell outside the aspiration window; re-search full width
+                    score, move = self._search_root(board, depth, -INF_SCORE, INF_SCORE, best_move)
+
+                if move is not None:
+                    best_move, best_score = move, score
+        finally:
+            self._incremental_base = None
+
+        # Fallback to random if the search somehow produced nothing
+        return best_move or random.choice(list(board.legal_moves))
+
+    def _search_root(self, board: chess.Board, depth: int, alpha: int, beta: int,
+                     first_move: Optional[chess.Move] = None) -> Tuple[int, Optional[chess.Move]]:
+        """Search the root position to the given depth, returning (score, move)"""
+        maximizing = board.turn
+        best = -INF_SCORE if maximizing else INF_SCORE
+        best_move = None
+
+        for move in self._order_moves(board, first_move):
+            self._push(board, move)
+            score = self._minimax(board, depth - 1, alpha, beta, not maximizing)
+            self._pop(board)
+
+            if maximizing:
+                if score > best:
+                    best, best_move = score, move
+                alpha = max(alpha, score)
+            else:
+                if score < best:
+                    best, best_move = score, move
+                beta = min(beta, score)
+            if beta <= alpha:
+                break
+
+        return best, best_move
+
+    def _order_moves(self, board: chess.Board, tt_move: Optional[chess.Move] = None,
+                     captures_only: bool = False, ply: Optional[int] = None) -> List[chess.Move]:
+        """Order moves so the likely-best ones are searched first
 
-    def _minimax(self, board: chess.Board, depth: int, alpha: float, beta: float, is_maximizing: bool) -> float:
-        """Minimax algorithm with alpha-beta pruning"""
-        if depth == 0 or board.is_game_over():
+        Captures are scored MVV-LVA (most valuable victim, least valuable
+        attacker), promotions get a bonus, and the transposition table's
+        best move from a previous visit is tried before anything else.
+        Quiet moves are ranked by the killer and history tables so cutoff
+        moves from sibling nodes come early. Alpha-beta prunes far more
+        when good moves come first.
+        """
+        piece_values = self.piece_values
+        killers = self._killers.get(ply, ()) if ply is not None else ()
+        history = self._history
+
+        def score(move: chess.Move) -> int:
+            if move == tt_move:
+                return 100000
+            if board.is_capture(move):
+                if board.is_en_passant(move):
+                    victim = chess.PAWN
+                else:
+                    victim = board.piece_at(move.to_square).piece_type
+                attacker = board.piece_at(move.from_square).piece_type
+                # Offset keeps every capture ahead of the killer moves
+                value = 10000 + 10 * piece_values[victim] - piece_values[attacker]
+                if move.promotion:
+                    value += piece_values[move.promotion]
+                return value
+            if move.promotion:
+                return piece_values[move.promotion]
+            if move in killers:
+                return 9000
+            return history[move.from_square][move.to_square]
+
+        if captures_only:
+            moves = [move for move in board.legal_moves if board.is_capture(move)]
+        else:
+            moves = board.legal_moves
+        return sorted(moves, key=score, reverse=True)
+
+    def _quiesce(self, board: chess.Board, alpha: int, beta: int, is_maximizing: bool) -> int:
+        """Extend the search through captures until the position is quiet
+
+        Cutting the search off mid-exchange makes leaf scores swing with
+        whoever captured last (the horizon effect). Stand-pat bounds plus
+        MVV-LVA-ordered captures settle the tactics cheaply.
+        """
+        stand_pat = self.evaluate_board(board)
+
+        if is_maximizing:
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
+            best = stand_pat
+            for move in self._order_moves(board, captures_only=True):
+                self._push(board, move)
+                score = self._quiesce(board, alpha, beta, False)
+                self._pop(board)
+                best = max(best, score)
+                alpha = max(alpha, score)
+                if beta <= alpha:
+                    break
+        else:
+            if stand_pat <= alpha:
+                return stand_pat
+            beta = min(beta, stand_pat)
+            best = stand_pat
+            for move in self._order_moves(board, captures_only=True):
+                self._push(board, move)
+                score = self._quiesce(board, alpha, beta, True)
+                self._pop(board)
+                best = min(best, score)
+                beta = min(beta, score)
+                if beta <= alpha:
+                    break
+        return best
+
+    def _record_cutoff(self, board: chess.Board, move: chess.Move, depth: int, ply: int):
+        """Remember a quiet move that caused a cutoff for future ordering"""
+        if board.is_capture(move) or move.promotion:
+            return
+        killers = self._killers.get(ply, ())
+        if not killers or killers[0] != move:
+            self._killers[ply] = (move, killers[0]) if killers else (move,)
+        self._history[move.from_square][move.to_square] += depth * depth
+
+    def _minimax(self, board: chess.Board, depth: int, alpha: int, beta: int,
+                 is_maximizing: bool, ply: int = 1) -> int:
+        """Minimax algorithm with alpha-beta pruning and a transposition table"""
+        # is_game_over() runs every terminal test including claimable
+        # draws; in the search only mate/stalemate matter, and those are
+        # exactly "no legal move" - which evaluate_board scores directly
+        if next(iter(board.legal_moves), None) is None:
             return self.evaluate_board(board)
-        
+        if depth == 0:
+            return self._quiesce(board, alpha, beta, is_maximizing)
+
+        # Probe the transposition table: positions reached via different
+        # move orders share their search results
+        key = chess.polyglot.zobrist_hash(board)
+        entry = self.transposition_table.get(key)
+        tt_move = entry[3] if entry is not None else None
+        if entry is not None and entry[0] >= depth:
+            _, value, flag, _ = entry
+            if flag == TT_EXACT:
+                return value
+            elif flag == TT_LOWERBOUND:
+                alpha = max(alpha, value)
+            else:  # TT_UPPERBOUND
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        alpha_orig = alpha
+        beta_orig = beta
+        best_move = None
+
         if is_maximizing:
-            max_eval = float('-inf')
-            for move in board.legal_moves:
-                board.push(move)
-                eval_score = self._minimax(board, depth - 1, alpha, beta, False)
-                board.pop()
-                max_eval = max(max_eval, eval_score)
+            best = -INF_SCORE
+            for move in self._order_moves(board, tt_move, ply=ply):
+                self._push(board, move)
+                eval_score = self._minimax(board, depth - 1, alpha, beta, False, ply + 1)
+                self._pop(board)
+                if eval_score > best:
+                    best = eval_score
+                    best_move = move
                 alpha = max(alpha, eval_score)
                 if beta <= alpha:
+                    self._record_cutoff(board, move, depth, ply)
                     break
-            return max_eval
         else:
-            min_eval = float('inf')
-            for move in board.legal_moves:
-                board.push(move)
-                eval_score = self._minimax(board, depth - 1, alpha, beta, True)
-                board.pop()
-                min_eval = min(min_eval, eval_score)
+            best = INF_SCORE
+            for move in self._order_moves(board, tt_move, ply=ply):
+                self._push(board, move)
+                eval_score = self._minimax(board, depth - 1, alpha, beta, True, ply + 1)
+                self._pop(board)
+                if eval_score < best:
+                    best = eval_score
+                    best_move = move
                 beta = min(beta, eval_score)
                 if beta <= alpha:
+                    self._record_cutoff(board, move, depth, ply)
                     break
-            return min_eval
+
+        # Store the result, flagged by where it landed in the original window
+        if best <= alpha_orig:
+            flag = TT_UPPERBOUND
+        elif best >= beta_orig:
+            flag = TT_LOWERBOUND
+        else:
+            flag = TT_EXACT
+        self.transposition_table[key] = (depth, best, flag, best_move)
+
+        return best
+
+# Point values used for user-facing material tallies
+POINT_VALUES = {
+    chess.PAWN: 1,
+    chess.KNIGHT: 3,
+    chess.BISHOP: 3,
+    chess.ROOK: 5,
+    chess.QUEEN: 9
+}
+
+class PositionStats:
+    """Material totals maintained incrementally as moves are played"""
+
+    def __init__(self, board: chess.Board):
+        self.white_material = 0
+        self.black_material = 0
+        self.recompute(board)
+
+    def recompute(self, board: chess.Board):
+        """Recompute totals from the piece bitboards"""
+        self.white_material = sum(
+            board.pieces_mask(piece_type, chess.WHITE).bit_count() * value
+            for piece_type, value in POINT_VALUES.items()
+        )
+        self.black_material = sum(
+            board.pieces_mask(piece_type, chess.BLACK).bit_count() * value
+            for piece_type, value in POINT_VALUES.items()
+        )
+
+    def apply_move(self, board: chess.Board, move: chess.Move):
+        """Apply the material delta for a move about to be pushed on the board"""
+        # Captures (including en passant) remove the captured piece's value
+        if board.is_en_passant(move):
+            captured_type = chess.PAWN
+        else:
+            captured = board.piece_at(move.to_square)
+            captured_type = captured.piece_type if captured else None
+
+        if captured_type is not None and captured_type in POINT_VALUES:
+            if board.turn:  # White captures a black piece
+                self.black_material -= POINT_VALUES[captured_type]
+            else:
+                self.white_material -= POINT_VALUES[captured_type]
+
+        # Promotions swap a pawn for the promoted piece
+        if move.promotion and move.promotion in POINT_VALUES:
+            gain = POINT_VALUES[move.promotion] - POINT_VALUES[chess.PAWN]
+            if board.turn:
+                self.white_material += gain
+            else:
+                self.black_material += gain
 
 class ChessGame:
     """Represents a chess game between two players"""
@@ -156,10 +476,22 @@ class ChessGame:
         self.created_at = time.time()
         self.last_move_time = time.time()
         self.last_message_id = None
+        self.board_png_cache = None  # (fen, png_bytes) of the last rendered board
+        self._pgn_cache = None  # (move_count, pgn), invalidated on move
+        self._suggest_cache = None  # (fen, suggestions), invalidated on move
         self.status = "active"  # active, finished
         self.result = None  # white_win, black_win, draw
+        self.stats = PositionStats(self.board)
         self.ai = ChessAI()
-        
+
+        # PGN game tree grown move-by-move; serializing never replays
+        self._pgn_game = chess.pgn.Game()
+        self._pgn_game.headers["Event"] = "Discord Chess Game"
+        self._pgn_game.headers["White"] = f"Player {white_id}"
+        self._pgn_game.headers["Black"] = f"Player {black_id}"
+        self._pgn_game.headers["Date"] = time.strftime("%Y.%m.%d")
+        self._pgn_node = self._pgn_game
+
         logger.info(f"New game created: {self.game_id} between {white_id} (White) and {black_id} (Black)")
     
     @property
@@ -169,18 +501,21 @@ class ChessGame:
     
     def get_pgn(self) -> str:
         """Get the game in PGN format"""
-        game = chess.pgn.Game()
-        game.headers["Event"] = "Discord Chess Game"
-        game.headers["White"] = f"Player {self.white_id}"
-        game.headers["Black"] = f"Player {self.black_id}"
-        game.headers["Date"] = time.strftime("%Y.%m.%d")
-        
-        # Add moves
-        node = game
-        for move in self.move_history:
-            node = node.add_variation(chess.Move.from_uci(move))
-            
-        return str(game)
+        # Serve the cached serialization if no move has been made since;
+        # otherwise serialize the incrementally built game tree
+        cached = self._pgn_cache
+        move_count = len(self.move_history)
+        if cached is not None and cached[0] == move_count:
+            return cached[1]
+
+        pgn = str(self._pgn_game)
+
+        # This may run in a worker thread; only cache the export if no
+        # move landed while it was being built, so a stale string can
+        # never be served for a newer position
+        if len(self.move_history) == move_count:
+            self._pgn_cache = (move_count, pgn)
+        return pgn
     
     def is_player_turn(self, user_id: int) -> bool:
         """Check if it's the specified player's turn"""
@@ -191,45 +526,42 @@ class ChessGame:
         try:
             # Try to parse the move (algebraic notation like "e4" or UCI like "e2e4")
             move = None
-            
-            # Try UCI notation first (e2e4)
+
+            # Try UCI notation first (e2e4); parse_uci checks legality in
+            # one pass, so no separate legal_moves membership scan is needed
             try:
-                move = chess.Move.from_uci(move_str)
-                if move not in self.board.legal_moves:
-                    move = None
+                move = self.board.parse_uci(move_str)
             except ValueError:
                 pass
-                
+
             # If UCI failed, try SAN notation (e4, Nf3, etc.)
             if not move:
                 try:
                     move = self.board.parse_san(move_str)
                 except ValueError:
                     pass
-            
-            # If both failed, check if it's a castling move
-            if not move and move_str.lower() in ["o-o", "0-0"]:
-                # Kingside castling
-                if self.board.turn:  # White
-                    move = chess.Move.from_uci("e1g1")
-                else:  # Black
-                    move = chess.Move.from_uci("e8g8")
-                    
-            if not move and move_str.lower() in ["o-o-o", "0-0-0"]:
-                # Queenside castling
-                if self.board.turn:  # White
-                    move = chess.Move.from_uci("e1c1")
-                else:  # Black
-                    move = chess.Move.from_uci("e8c8")
-            
-            if not move or move not in self.board.legal_moves:
+
+            # If both failed, accept castling spelled with zeroes
+            if not move:
+                normalized = move_str.lower()
+                if normalized in ("0-0", "o-o", "0-0-0", "o-o-o"):
+                    try:
+                        move = self.board.parse_san("O-O" if len(normalized) == 3 else "O-O-O")
+                    except ValueError:
+                        pass
+
+            if not move:
                 return False, "Invalid move. Please use algebraic notation (e.g., 'e4', 'Nf3') or UCI notation (e.g., 'e2e4')."
             
-            # Make the move
+            # Make the move (stats delta must be applied before the push)
+            self.stats.apply_move(self.board, move)
             self.board.push(move)
+            self._pgn_node = self._pgn_node.add_main_variation(move)
             self.move_history.append(move.uci())
             self.last_move_time = time.time()
-            
+            self._pgn_cache = None
+            self._suggest_cache = None
+
             # Check game status
             status_msg = ""
             if self.board.is_checkmate():
@@ -250,7 +582,7 @@ class ChessGame:
             
             return True, status_msg
         except Exception as e:
-            logger.error(f"Error making move: {str(e)}")
+            logger.error("Error making move: %s", e, exc_info=True)
             return False, f"Error making move: {str(e)}"
     
     def get_game_state(self) -> Dict:
@@ -273,30 +605,41 @@ class ChessGame:
             "is_insufficient_material": self.board.is_insufficient_material()
         }
     
-    def get_move_suggestions(self, count: int = 3) -> List[Tuple[str, float]]:
-        """Get top move suggestions from the AI"""
-        if self.board.is_game_over():
+    def get_move_suggestions(self, count: int = 3) -> List[Tuple[str, int]]:
+        """Get top move suggestions from the AI
+
+        Scores a private copy of the board, so it is safe to run in a
+        worker thread while moves land on the live board.
+        """
+        board = self.board.copy(stack=False)
+        if board.is_game_over():
             return []
-        
-        suggestions = []
-        legal_moves = list(self.board.legal_moves)
-        
+
+        # Reuse the evaluation when the position hasn't changed (e.g. a
+        # suggest followed by an analyze before the next move)
+        fen = board.fen()
+        if self._suggest_cache is not None and self._suggest_cache[0] == fen and len(self._suggest_cache[1]) >= count:
+            return self._suggest_cache[1][:count]
+
+        scored = []
+        legal_moves = list(board.legal_moves)
+
         # Evaluate each move
         for move in legal_moves[:min(10, len(legal_moves))]:  # Limit to 10 candidates for performance
-            self.board.push(move)
-            evaluation = self.ai.evaluate_board(self.board)
-            self.board.pop()
-            
-            san_move = self.board.san(move)
-            suggestions.append((san_move, evaluation))
-        
+            board.push(move)
+            evaluation = self.ai.evaluate_board(board)
+            board.pop()
+            scored.append((move, evaluation))
+
         # Sort by evaluation (highest first for white, lowest first for black)
-        if self.board.turn:  # White's turn
-            suggestions.sort(key=lambda x: x[1], reverse=True)
-        else:  # Black's turn
-            suggestions.sort(key=lambda x: x[1])
-        
-        return suggestions[:count]
+        scored.sort(key=lambda x: x[1], reverse=board.turn)
+
+        # SAN conversion regenerates legal moves to disambiguate, so only
+        # convert the moves that will actually be returned
+        suggestions = [(board.san(move), evaluation) for move, evaluation in scored[:count]]
+
+        self._suggest_cache = (fen, suggestions)
+        return suggestions
     
     def get_ai_move(self) -> Optional[str]:
         """Get a move from the AI"""
@@ -308,37 +651,37 @@ class GameManager:
     
     def __init__(self):
         """Initialize the game manager"""
-        self.active_games = {}  # channel_id -> game
-        self.player_games = {}  # player_id -> set of game_ids
+        self.active_games = {}  # game_id -> game
+        self.player_games = {}  # player_id -> OrderedDict of game_ids, newest first
+        self.games_by_channel = {}  # channel_id -> latest active game
+        self._expiry_heap = []  # (last_move_time, game_id), lazily invalidated
         logger.info("Game manager initialized")
     
     def create_game(self, white_id: int, black_id: int, channel_id: int) -> ChessGame:
         """Create a new game between two players"""
-        # Check if players are already in a game in this channel
-        for game in self.active_games.values():
-            if (game.channel_id == channel_id and 
-                (white_id in [game.white_id, game.black_id] or 
-                 black_id in [game.white_id, game.black_id]) and
-                game.status == "active"):
-                
-                # One of these players is already in a game in this channel
-                raise ValueError(f"One of the players is already in an active game in this channel")
+        # Check if players are already in a game in this channel; only
+        # each player's own games need checking, not every active game
+        for player_id in (white_id, black_id):
+            for game_id in self.player_games.get(player_id, ()):
+                game = self.active_games.get(game_id)
+                if game and game.channel_id == channel_id and game.status == "active":
+                    raise ValueError(f"One of the players is already in an active game in this channel")
         
         # Create new game
         game = ChessGame(white_id, black_id, channel_id)
         
         # Register game
         self.active_games[game.game_id] = game
+        self.games_by_channel[channel_id] = game
+        heapq.heappush(self._expiry_heap, (game.last_move_time, game.game_id))
         
-        # Register players
-        if white_id not in self.player_games:
-            self.player_games[white_id] = set()
-        self.player_games[white_id].add(game.game_id)
-        
-        if black_id not in self.player_games:
-            self.player_games[black_id] = set()
-        self.player_games[black_id].add(game.game_id)
-        
+        # Register players, newest game first so lookups can stop at the
+        # first active match
+        for player_id in (white_id, black_id):
+            player_games = self.player_games.setdefault(player_id, OrderedDict())
+            player_games[game.game_id] = None
+            player_games.move_to_end(game.game_id, last=False)
+
         return game
     
     def get_game(self, game_id: str) -> Optional[ChessGame]:
@@ -347,37 +690,42 @@ class GameManager:
     
     def get_game_by_channel(self, channel_id: int) -> Optional[ChessGame]:
         """Get the latest active game in a channel"""
+        # O(1) index hit for the common case
+        game = self.games_by_channel.get(channel_id)
+        if game and game.status == "active":
+            return game
+
+        # The indexed game finished (or there is none) - fall back to a scan
+        # in case an older active game remains in the channel, and refresh
+        # the index with the result
         matching_games = [
             game for game in self.active_games.values()
             if game.channel_id == channel_id and game.status == "active"
         ]
-        
+
         if not matching_games:
+            self.games_by_channel.pop(channel_id, None)
             return None
-            
+
         # Return the most recent game
-        return max(matching_games, key=lambda g: g.created_at)
+        latest = max(matching_games, key=lambda g: g.created_at)
+        self.games_by_channel[channel_id] = latest
+        return latest
     
     def get_player_game(self, player_id: int, channel_id: int = None) -> Optional[ChessGame]:
         """Get an active game that a player is participating in"""
         if player_id not in self.player_games:
             return None
             
-        game_ids = self.player_games[player_id]
-        matching_games = []
-        
-        for game_id in game_ids:
-            if game_id in self.active_games:
-                game = self.active_games[game_id]
-                if game.status == "active":
-                    if channel_id is None or game.channel_id == channel_id:
-                        matching_games.append(game)
-        
-        if not matching_games:
-            return None
-            
-        # Return the most recent game
-        return max(matching_games, key=lambda g: g.created_at)
+        # Ids are kept newest-first, so the first active match is the most
+        # recent game - no list build or max() needed
+        for game_id in self.player_games[player_id]:
+            game = self.active_games.get(game_id)
+            if game and game.status == "active":
+                if channel_id is None or game.channel_id == channel_id:
+                    return game
+
+        return None
     
     def remove_game(self, game_id: str) -> bool:
         """Remove a game from the active games"""
@@ -388,13 +736,15 @@ class GameManager:
         
         # Remove from player registrations
         if game.white_id in self.player_games:
-            self.player_games[game.white_id].discard(game_id)
+            self.player_games[game.white_id].pop(game_id, None)
         if game.black_id in self.player_games:
-            self.player_games[game.black_id].discard(game_id)
+            self.player_games[game.black_id].pop(game_id, None)
             
         # Remove the game
         del self.active_games[game_id]
-        
+        if self.games_by_channel.get(game.channel_id) is game:
+            del self.games_by_channel[game.channel_id]
+
         return True
     
     def resign_game(self, game_id: str, player_id: int) -> bool:
@@ -417,21 +767,41 @@ class GameManager:
     def cleanup_stale_games(self, max_inactive_time: int = 3600) -> int:
         """Clean up games that have been inactive for too long"""
         current_time = time.time()
-        stale_game_ids = []
-        
-        for game_id, game in self.active_games.items():
-            if game.status == "active" and current_time - game.last_move_time > max_inactive_time:
+        removed = 0
+        heap = self._expiry_heap
+
+        # Pop only entries old enough to matter; entries outdated by later
+        # moves are rescheduled at the game's real timestamp (lazy deletion)
+        while heap and heap[0][0] + max_inactive_time <= current_time:
+            entry_time, game_id = heapq.heappop(heap)
+            game = self.active_games.get(game_id)
+            if game is None:
+                continue  # Game already ended and was removed
+            if game.last_move_time != entry_time:
+                heapq.heappush(heap, (game.last_move_time, game_id))
+                continue
+            if game.status == "active":
                 # Game has been inactive for too long
                 game.status = "finished"
                 game.result = "abandoned"
-                stale_game_ids.append(game_id)
-        
-        # Remove stale games
-        for game_id in stale_game_ids:
+                removed += 1
             self.remove_game(game_id)
-            
-        return len(stale_game_ids)
-    
+
+        return removed
+
+    def next_stale_deadline(self, max_inactive_time: int = 3600) -> Optional[float]:
+        """Get the earliest time at which an active game may become stale
+
+        Reads the expiry heap, so the result can be early for games that
+        have moved since their entry was pushed; cleanup_stale_games
+        revalidates before expiring anything.
+        """
+        while self._expiry_heap and self._expiry_heap[0][1] not in self.active_games:
+            heapq.heappop(self._expiry_heap)  # Drop entries for removed games
+        if not self._expiry_heap:
+            return None
+        return self._expiry_heap[0][0] + max_inactive_time
+
     def get_statistics(self) -> Dict:
         """Get statistics about games"""
         total_games = len(self.active_games)
@@ -3,17 +3,87 @@ import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 import asyncio
+import bisect
 import chess
-from typing import Dict, List, Optional, Tuple, Union
+import functools
+import heapq
+import io
+from typing import Optional, Tuple
 import time
 import re
-import os
+from collections import OrderedDict
+from dataclasses import dataclass
 
 from chess_engine import GameManager, ChessGame
 from ui_renderer import ChessEmbedRenderer
-from utils import logger, CooldownManager, send_with_retry, format_exception
+from utils import logger, format_exception
 from cogs.ui_components import ChallengeButtons
 
+# Precompiled validator for move input: UCI (e2e4), castling (O-O / 0-0-0),
+# or SAN (e4, Nf3, Qxd5, e8=Q+). Rejects malformed input before it reaches
+# the python-chess parsers.
+_MOVE_RE = re.compile(
+    r'^(?:'
+    r'[a-h][1-8][a-h][1-8][qrbnQRBN]?'      # UCI
+    r'|[Oo0]-[Oo0](?:-[Oo0])?[+#]?'         # Castling, with optional check/mate
+    r'|[KQRBN]?[a-h]?[1-8]?x?[a-h][1-8](?:=[QRBN])?[+#]?'  # SAN
+    r')$'
+)
+
+# Cap concurrent engine work so a burst of /chess suggest or analyze
+# calls can't fill the shared thread pool and starve board rendering;
+# commands defer before waiting here, so the ack is never delayed
+_ENGINE_SEM = asyncio.Semaphore(4)
+
+def _material(board: chess.Board, color: chess.Color) -> int:
+    """Material in points for one side, unrolled over the piece bitboards"""
+    return (board.pieces_mask(chess.PAWN, color).bit_count()
+            + 3 * board.pieces_mask(chess.KNIGHT, color).bit_count()
+            + 3 * board.pieces_mask(chess.BISHOP, color).bit_count()
+            + 5 * board.pieces_mask(chess.ROOK, color).bit_count()
+            + 9 * board.pieces_mask(chess.QUEEN, color).bit_count())
+
+def _safe_command(fn):
+    """Wrap a command callback with the shared error logging and reply path"""
+    @functools.wraps(fn)
+    async def wrapper(self, interaction: discord.Interaction, *args, **kwargs):
+        try:
+            return await fn(self, interaction, *args, **kwargs)
+        except Exception as e:
+            logger.error("Error in %s: %s", fn.__name__, e, exc_info=True)
+            try:
+                if interaction.response.is_done():
+                    await interaction.followup.send(f"An error occurred: {format_exception(e)}", ephemeral=True)
+                else:
+                    await interaction.response.send_message(f"An error occurred: {format_exception(e)}", ephemeral=True)
+            except Exception as send_error:
+                logger.error("Failed to send error message: %s", send_error)
+    return wrapper
+
+def _bounded_count(iterable, limit: int) -> int:
+    """Count items from a generator, stopping once limit is exceeded"""
+    count = 0
+    for _ in iterable:
+        count += 1
+        if count > limit:
+            break
+    return count
+
+# Static parts of the challenge-declined embed, built once at import time
+_DECLINE_TEMPLATE = {
+    "title": "Chess Challenge Declined",
+    "color": discord.Color.red().value,
+}
+
+@dataclass(slots=True)
+class Challenge:
+    """A pending challenge awaiting a response in a channel"""
+    challenger_id: int
+    challenged_id: int
+    expire_time: float
+    message: Optional[discord.Message] = None
+    view: Optional[ChallengeButtons] = None
+
 class ChessCommands(commands.GroupCog, group_name="chess"):
     """Cog for chess game commands"""
 
@@ -22,13 +92,111 @@ class ChessCommands(commands.GroupCog, group_name="chess"):
         self.bot = bot
         self.game_manager = GameManager()
         self.embed_renderer = ChessEmbedRenderer()
-        self.cooldown_manager = CooldownManager()
-        self.active_challenges = {}  # channel_id -> challenger_id, challenged_id, expire_time
+        self.active_challenges = {}  # channel_id -> Challenge
+        self._user_cache = OrderedDict()  # user_id -> (cached_at, user), LRU order
+        self._user_cache_ttl = 600  # 10 minutes
+        self._user_cache_max = 1024  # Bounded so a busy bot can't grow it forever
+        self._challenge_expiry_heap = []  # (expire_time, channel_id)
+        self._challenge_expiry_event = asyncio.Event()
+        self._challenge_expiry_task = None
+
+    async def cog_load(self):
+        """Start background workers once the cog is fully attached to the bot"""
+        self._challenge_expiry_task = asyncio.create_task(self._challenge_expiry_worker())
         self.cleanup_loop.start()
 
+        # Warm the static help embed so even the first /chess help is instant
+        await self.embed_renderer.render_help_embed()
+
     def cog_unload(self):
         """Clean up when cog is unloaded"""
         self.cleanup_loop.cancel()
+        if self._challenge_expiry_task:
+            self._challenge_expiry_task.cancel()
+
+    async def _challenge_expiry_worker(self):
+        """Expire stale challenges exactly at their deadline instead of polling
+
+        Sleeps until the earliest pending expiry (or indefinitely when there are
+        none) and is woken early via the event whenever a new challenge is issued.
+        """
+        await self.bot.wait_until_ready()
+        while True:
+            now = time.monotonic()
+
+            # Drop every challenge whose deadline has passed
+            while self._challenge_expiry_heap and self._challenge_expiry_heap[0][0] <= now:
+                _, channel_id = heapq.heappop(self._challenge_expiry_heap)
+                challenge = self.active_challenges.get(channel_id)
+                if challenge and challenge.expire_time <= now:
+                    self.active_challenges.pop(channel_id, None)
+
+                    # Resolve the view so the waiting challenge command
+                    # returns; the view itself carries no timer
+                    if challenge.view:
+                        challenge.view.expire()
+
+                    # Edit the stored message directly - no channel lookup or
+                    # fetch_message round-trip needed
+                    if challenge.message:
+                        try:
+                            await challenge.message.edit(content="This challenge has expired.", view=None)
+                        except discord.NotFound:
+                            pass
+                        except Exception as e:
+                            logger.error("Error editing expired challenge message: %s", e, exc_info=True)
+
+                    logger.info(f"Challenge in channel {channel_id} expired")
+
+            # Sleep until the next deadline, or until a new challenge arrives
+            delay = self._challenge_expiry_heap[0][0] - now if self._challenge_expiry_heap else 3600
+            try:
+                await asyncio.wait_for(self._challenge_expiry_event.wait(), timeout=delay)
+                self._challenge_expiry_event.clear()
+            except asyncio.TimeoutError:
+                pass
+
+    async def _get_user(self, user_id: int) -> discord.User:
+        """Get a user, preferring the client cache and a TTL-bounded local cache over REST fetches"""
+        # Discord.py's own cache is free to check
+        user = self.bot.get_user(user_id)
+        if user:
+            return user
+
+        # Check our local cache next
+        cached = self._user_cache.get(user_id)
+        if cached and time.monotonic() - cached[0] < self._user_cache_ttl:
+            self._user_cache.move_to_end(user_id)
+            return cached[1]
+
+        # Fall back to a REST fetch and remember the result,
+        # evicting the least recently used entry when full
+        user = await self.bot.fetch_user(user_id)
+        self._user_cache[user_id] = (time.monotonic(), user)
+        self._user_cache.move_to_end(user_id)
+        if len(self._user_cache) > self._user_cache_max:
+            self._user_cache.popitem(last=False)
+        return user
+
+    async def _get_channel_game(self, interaction: discord.Interaction) -> Optional[ChessGame]:
+        """Find the channel's active game, sending an ephemeral error if there is none"""
+        game = self.game_manager.get_game_by_channel(interaction.channel_id)
+        if not game:
+            message = "There is no active chess game in this channel. Start one with `/chess challenge`"
+            if interaction.response.is_done():
+                await interaction.followup.send(message, ephemeral=True)
+            else:
+                await interaction.response.send_message(message, ephemeral=True)
+            return None
+        return game
+
+    async def _fetch_players(self, game: ChessGame) -> Tuple[discord.User, discord.User]:
+        """Fetch both players concurrently through the user cache"""
+        white_user, black_user = await asyncio.gather(
+            self._get_user(game.white_id),
+            self._get_user(game.black_id)
+        )
+        return white_user, black_user
 
     @tasks.loop(minutes=5.0)
     async def cleanup_loop(self):
@@ -38,8 +206,24 @@ class ChessCommands(commands.GroupCog, group_name="chess"):
             stale_count = self.game_manager.cleanup_stale_games(max_inactive_time=3600)
             if stale_count > 0:
                 logger.info(f"Cleaned up {stale_count} stale games")
+
+            # Evict expired entries from the user cache
+            now = time.monotonic()
+            expired = [uid for uid, (cached_at, _) in self._user_cache.items()
+                       if now - cached_at >= self._user_cache_ttl]
+            for uid in expired:
+                del self._user_cache[uid]
+
+            # Sleep until the next game goes stale rather than on a fixed
+            # schedule, clamped between 1 and 5 minutes
+            deadline = self.game_manager.next_stale_deadline(max_inactive_time=3600)
+            if deadline is not None:
+                delay = min(max(deadline - time.time(), 60.0), 300.0)
+            else:
+                delay = 300.0
+            self.cleanup_loop.change_interval(seconds=delay)
         except Exception as e:
-            logger.error(f"Error in cleanup loop: {str(e)}")
+            logger.error("Error in cleanup loop: %s", e, exc_info=True)
 
     @cleanup_loop.before_loop
     async def before_cleanup(self):
@@ -56,100 +240,105 @@ class ChessCommands(commands.GroupCog, group_name="chess"):
     @app_commands.describe(
         opponent="The player you want to challenge to a chess game"
     )
+    @app_commands.checks.cooldown(1, 10.0)
+    @_safe_command
     async def chess_challenge(self, interaction: discord.Interaction, opponent: discord.Member):
         """Challenge another user to a chess game"""
-        if self.cooldown_manager.is_on_cooldown(interaction.user.id, "challenge", 10):
-            cooldown = self.cooldown_manager.get_remaining_cooldown(interaction.user.id, "challenge")
+        # Check if opponent is valid
+        if opponent.id == interaction.user.id:
+            await interaction.response.send_message("You can't challenge yourself to a game.", ephemeral=True)
+            return
+
+        if opponent.bot:
+            await interaction.response.send_message("You can't challenge a bot to a game.", ephemeral=True)
+            return
+
+        # Check if already in a game in this channel
+        existing_game = self.game_manager.get_player_game(interaction.user.id, interaction.channel_id)
+        if existing_game:
+            await interaction.response.send_message(
+                "You are already in a game in this channel. Finish or resign that game first.",
+                ephemeral=True
+            )
+            return
+
+        # Check if there's already an active challenge in this channel
+        if interaction.channel_id in self.active_challenges:
             await interaction.response.send_message(
-                f"Please wait {cooldown:.1f} seconds before issuing another challenge.",
+                "There's already an active challenge in this channel. Wait for it to be accepted, declined, or expire.",
                 ephemeral=True
             )
             return
-        
+
+        # Claim the channel slot before the first await so two
+        # near-simultaneous challenges can't both pass the check above
+        # and silently overwrite each other
+        view = ChallengeButtons(interaction.user, opponent)
+        expire_time = time.monotonic() + 300  # 5 minutes
+        challenge = Challenge(interaction.user.id, opponent.id, expire_time, None, view)
+        self.active_challenges[interaction.channel_id] = challenge
+        heapq.heappush(self._challenge_expiry_heap, (expire_time, interaction.channel_id))
+        self._challenge_expiry_event.set()
+
+        # Create and send challenge embed with buttons, storing the sent
+        # message so expiry can edit it without a fetch
         try:
-            # Check if opponent is valid
-            if opponent.id == interaction.user.id:
-                await interaction.response.send_message("You can't challenge yourself to a game.", ephemeral=True)
-                return
-                
-            if opponent.bot:
-                await interaction.response.send_message("You can't challenge a bot to a game.", ephemeral=True)
-                return
-            
-            # Check if already in a game in this channel
-            existing_game = self.game_manager.get_player_game(interaction.user.id, interaction.channel_id)
-            if existing_game:
-                await interaction.response.send_message(
-                    "You are already in a game in this channel. Finish or resign that game first.",
-                    ephemeral=True
-                )
-                return
-                
-            # Check if there's already an active challenge in this channel
-            if interaction.channel_id in self.active_challenges:
-                await interaction.response.send_message(
-                    "There's already an active challenge in this channel. Wait for it to be accepted, declined, or expire.",
-                    ephemeral=True
-                )
-                return
-            
-            # Create and send challenge embed with buttons
             challenge_embed = await self.embed_renderer.render_challenge_embed(interaction.user, opponent)
-            
-            # Create the button view
-            view = ChallengeButtons(interaction.user, opponent)
-            
-            # Send the challenge message
             await interaction.response.send_message(
                 f"{opponent.mention}, you've been challenged to a chess game by {interaction.user.mention}!",
                 embed=challenge_embed,
                 view=view
             )
-            
-            # Store challenge data with 5-minute expiration
-            expire_time = time.time() + 300  # 5 minutes
-            self.active_challenges[interaction.channel_id] = (interaction.user.id, opponent.id, expire_time)
-            
-            # Wait for the button response
-            await view.wait()
-            
-            # Remove from active challenges
+            challenge.message = await interaction.original_response()
+        except Exception:
+            # Release the slot so a failed send doesn't block the channel
+            # until the challenge expires
             self.active_challenges.pop(interaction.channel_id, None)
-            
-            # Handle the response
-            if view.response is True:
-                # Challenge accepted
-                game = await self.start_game(interaction.channel, interaction.user, opponent)
-                if game:
-                    await interaction.followup.send(
-                        f"Game started! {interaction.user.mention} (White) vs {opponent.mention} (Black)\n"
-                        f"{interaction.user.mention}'s turn. Make a move using `/chess move`"
-                    )
-            elif view.response is False:
-                # Challenge declined
-                decline_embed = discord.Embed(
-                    title="Chess Challenge Declined", 
-                    description=f"{opponent.mention} has declined the chess challenge.", 
-                    color=discord.Color.red()
-                )
-                await interaction.followup.send(embed=decline_embed)
-            else:
-                # Challenge expired
+            view.expire()
+            raise
+
+        # Wait for the button response directly on the view's future
+        response = await view.wait_response()
+
+        # Remove from active challenges
+        self.active_challenges.pop(interaction.channel_id, None)
+
+        # Handle the response
+        if response is True:
+            # Challenge accepted
+            game = await self.start_game(interaction.channel, interaction.user, opponent)
+            if game:
                 await interaction.followup.send(
-                    f"{interaction.user.mention}'s challenge to {opponent.mention} has expired.",
-                    ephemeral=True
+                    f"Game started! {interaction.user.mention} (White) vs {opponent.mention} (Black)\n"
+                    f"{interaction.user.mention}'s turn. Make a move using `/chess move`"
                 )
-        
-        except Exception as e:
-            logger.error(f"Error in challenge command: {str(e)}")
-            await interaction.followup.send(f"An error occurred: {format_exception(e)}")
+        elif response is False:
+            # Challenge declined - build from the static template
+            decline_embed = discord.Embed.from_dict({
+                **_DECLINE_TEMPLATE,
+                "description": f"{opponent.mention} has declined the chess challenge.",
+            })
+            await interaction.followup.send(embed=decline_embed)
+        else:
+            # Challenge expired
+            await interaction.followup.send(
+                f"{interaction.user.mention}'s challenge to {opponent.mention} has expired.",
+                ephemeral=True
+            )
+
 
     async def start_game(self, channel, white_player, black_player):
         """Start a new chess game between two players"""
         try:
             # Create a new game
             game = self.game_manager.create_game(white_player.id, black_player.id, channel.id)
-            
+
+            # Seed the user cache with the players we already hold, so the
+            # first moves never need a REST fetch
+            now = time.monotonic()
+            self._user_cache[white_player.id] = (now, white_player)
+            self._user_cache[black_player.id] = (now, black_player)
+
             # Render and send the initial board
             embed, file = await self.embed_renderer.render_game_embed(
                 game, white_user=white_player, black_user=black_player, bot=self.bot
@@ -166,7 +355,7 @@ class ChessCommands(commands.GroupCog, group_name="chess"):
             return game
             
         except Exception as e:
-            logger.error(f"Error starting game: {str(e)}")
+            logger.error("Error starting game: %s", e, exc_info=True)
             await channel.send(f"Error starting game: {format_exception(e)}")
             return None
 
@@ -174,385 +363,348 @@ class ChessCommands(commands.GroupCog, group_name="chess"):
     @app_commands.describe(
         move="Your chess move in algebraic notation (e.g., e4 or e2e4)"
     )
+    @_safe_command
     async def chess_move(self, interaction: discord.Interaction, move: str):
         """Make a move in the current chess game"""
-        try:
-            # Find the current game in this channel
-            game = self.game_manager.get_game_by_channel(interaction.channel_id)
-            
-            if not game:
-                await interaction.response.send_message(
-                    "There is no active chess game in this channel. Start one with `/chess challenge`",
-                    ephemeral=True
-                )
-                return
-                
-            # Check if it's the player's turn
-            if not game.is_player_turn(interaction.user.id):
-                current_player_id = game.current_player_id
-                try:
-                    current_player = await self.bot.fetch_user(current_player_id)
-                    await interaction.response.send_message(
-                        f"It's not your turn. Waiting for {current_player.mention} to move.",
-                        ephemeral=True
-                    )
-                except Exception:
-                    await interaction.response.send_message(
-                        f"It's not your turn. Waiting for the other player to move.",
-                        ephemeral=True
-                    )
-                return
-            
-            # Acknowledge the command
-            await interaction.response.defer()
-            
-            # Make the move
-            success, message = game.make_move(move)
-            
-            if not success:
-                await interaction.followup.send(f"Invalid move: {message}")
-                return
-            
-            # Get the players
-            white_user = await self.bot.fetch_user(game.white_id)
-            black_user = await self.bot.fetch_user(game.black_id)
-            
-            # Render the updated board
-            embed, file = await self.embed_renderer.render_game_embed(
-                game, white_user=white_user, black_user=black_user, bot=self.bot
+        # Fast-reject input that can't possibly be a move before doing
+        # any game lookups or parsing
+        move = move.strip()
+        if not _MOVE_RE.match(move[:16]):
+            await interaction.response.send_message(
+                "Invalid move format. Please use algebraic notation (e.g., 'e4', 'Nf3') or UCI notation (e.g., 'e2e4').",
+                ephemeral=True
             )
-            
-            # Send the updated board
-            move_message = await interaction.followup.send(embed=embed, file=file)
-            
-            # Update the last message ID if possible
-            if hasattr(move_message, "id"):
-                game.last_message_id = move_message.id
-            
-            # Notify about status
-            if message:  # Status message from the move (checkmate, etc.)
-                await interaction.channel.send(message)
-                
-                if game.status == "finished":
-                    # Game is over, send final message
-                    if game.result == "white_win":
-                        await interaction.channel.send(f"{white_user.mention} (White) wins! Game over.")
-                    elif game.result == "black_win":
-                        await interaction.channel.send(f"{black_user.mention} (Black) wins! Game over.")
-                    else:
-                        await interaction.channel.send("Game ended in a draw!")
-                        
-                    # Include PGN
-                    pgn = game.get_pgn()
-                    await interaction.channel.send(f"Game PGN:\n```{pgn}```")
-            
-            # If game continues, notify next player
-            if game.status == "active":
-                next_player_id = game.current_player_id
-                next_player = await self.bot.fetch_user(next_player_id)
-                await interaction.channel.send(f"{next_player.mention}'s turn. Make a move using `/chess move`")
-        
-        except Exception as e:
-            logger.error(f"Error making move: {str(e)}")
-            if interaction.response.is_done():
-                await interaction.followup.send(f"An error occurred: {format_exception(e)}")
+            return
+
+        # Find the current game in this channel
+        game = await self._get_channel_game(interaction)
+        if not game:
+            return
+
+        # Check if it's the player's turn. A raw <@id> mention renders the
+        # same as user.mention, so no user lookup is needed here
+        if not game.is_player_turn(interaction.user.id):
+            await interaction.response.send_message(
+                f"It's not your turn. Waiting for <@{game.current_player_id}> to move.",
+                ephemeral=True
+            )
+            return
+
+        # Acknowledge the command
+        await interaction.response.defer()
+
+        # Make the move
+        success, message = game.make_move(move)
+
+        if not success:
+            await interaction.followup.send(f"Invalid move: {message}")
+            return
+
+        # Get the players
+        white_user, black_user = await self._fetch_players(game)
+
+        # Render the updated board
+        embed, file = await self.embed_renderer.render_game_embed(
+            game, white_user=white_user, black_user=black_user, bot=self.bot
+        )
+
+        # Bundle status, result, and next-turn prompt into one message
+        # instead of a separate HTTP round-trip for each
+        content_parts = []
+        files = [file] if file else []
+
+        if message:  # Status message from the move (checkmate, etc.)
+            content_parts.append(message)
+
+        # Bind the post-move state into locals once
+        status, result = game.status, game.result
+
+        if status == "finished":
+            # Game is over, append the final message
+            if result == "white_win":
+                content_parts.append(f"{white_user.mention} (White) wins! Game over.")
+            elif result == "black_win":
+                content_parts.append(f"{black_user.mention} (Black) wins! Game over.")
             else:
-                await interaction.response.send_message(f"An error occurred: {format_exception(e)}", ephemeral=True)
+                content_parts.append("Game ended in a draw!")
+
+            # Attach the PGN as a file on the same message
+            pgn = await asyncio.to_thread(game.get_pgn)
+            files.append(discord.File(io.BytesIO(pgn.encode()), filename="game.pgn"))
+        else:
+            # Game continues, prompt the next player
+            next_player = white_user if game.board.turn else black_user
+            content_parts.append(f"{next_player.mention}'s turn. Make a move using `/chess move`")
+
+        # Send everything in a single message
+        move_message = await interaction.followup.send(
+            content="\n".join(content_parts),
+            embed=embed,
+            files=files
+        )
+
+        # Update the last message ID if possible
+        if hasattr(move_message, "id"):
+            game.last_message_id = move_message.id
+
 
     @app_commands.command(name="board")
+    @_safe_command
     async def chess_board(self, interaction: discord.Interaction):
         """Show the current board state"""
-        try:
-            # Find the current game in this channel
-            game = self.game_manager.get_game_by_channel(interaction.channel_id)
-            
-            if not game:
-                await interaction.response.send_message(
-                    "There is no active chess game in this channel. Start one with `/chess challenge`",
-                    ephemeral=True
-                )
-                return
-            
-            # Get the players
-            white_user = await self.bot.fetch_user(game.white_id)
-            black_user = await self.bot.fetch_user(game.black_id)
-            
-            # Render the board
-            embed, file = await self.embed_renderer.render_game_embed(
-                game, white_user=white_user, black_user=black_user, bot=self.bot
-            )
-            
-            # Send the board
-            await interaction.response.send_message(embed=embed, file=file)
-            
-        except Exception as e:
-            logger.error(f"Error showing board: {str(e)}")
-            await interaction.response.send_message(f"An error occurred: {format_exception(e)}", ephemeral=True)
+        # Find the current game in this channel; the lookup is a dict hit,
+        # so do it before deferring to keep the error reply ephemeral
+        game = await self._get_channel_game(interaction)
+        if not game:
+            return
+
+        # Acknowledge before rendering so it can't outrun the 3s ACK window
+        await interaction.response.defer()
+
+        # Get the players
+        white_user, black_user = await self._fetch_players(game)
+
+        # Render the board
+        embed, file = await self.embed_renderer.render_game_embed(
+            game, white_user=white_user, black_user=black_user, bot=self.bot
+        )
+
+        # Send the board
+        await interaction.followup.send(embed=embed, file=file)
+
 
     @app_commands.command(name="resign")
+    @_safe_command
     async def chess_resign(self, interaction: discord.Interaction):
         """Resign from the current game"""
-        try:
-            # Find the player's game in this channel
-            game = self.game_manager.get_player_game(interaction.user.id, interaction.channel_id)
-            
-            if not game:
-                await interaction.response.send_message(
-                    "You are not in an active chess game in this channel.",
-                    ephemeral=True
-                )
-                return
-            
-            # Acknowledge the command
-            await interaction.response.defer()
-            
-            # Resign the game
-            result = self.game_manager.resign_game(game.game_id, interaction.user.id)
-            
-            if not result:
-                await interaction.followup.send("Failed to resign the game.")
-                return
-            
-            # Get the players
-            white_user = await self.bot.fetch_user(game.white_id)
-            black_user = await self.bot.fetch_user(game.black_id)
-            
-            # Determine winner
-            if interaction.user.id == game.white_id:
-                winner = black_user
-                winner_color = "Black"
-            else:
-                winner = white_user
-                winner_color = "White"
-            
-            # Send resign message
-            await interaction.followup.send(f"{interaction.user.mention} has resigned. {winner.mention} ({winner_color}) wins!")
-            
-            # Render final board
-            embed, file = await self.embed_renderer.render_game_embed(
-                game, white_user=white_user, black_user=black_user, bot=self.bot
+        # Find the player's game in this channel
+        game = self.game_manager.get_player_game(interaction.user.id, interaction.channel_id)
+
+        if not game:
+            await interaction.response.send_message(
+                "You are not in an active chess game in this channel.",
+                ephemeral=True
             )
-            
-            # Send the final board
-            await interaction.channel.send(embed=embed, file=file)
-            
-            # Include PGN
-            pgn = game.get_pgn()
-            await interaction.channel.send(f"Game PGN:\n```{pgn}```")
-            
-        except Exception as e:
-            logger.error(f"Error resigning game: {str(e)}")
-            if interaction.response.is_done():
-                await interaction.followup.send(f"An error occurred: {format_exception(e)}")
-            else:
-                await interaction.response.send_message(f"An error occurred: {format_exception(e)}", ephemeral=True)
+            return
+
+        # Acknowledge the command
+        await interaction.response.defer()
+
+        # Resign the game
+        result = self.game_manager.resign_game(game.game_id, interaction.user.id)
+
+        if not result:
+            await interaction.followup.send("Failed to resign the game.")
+            return
+
+        # Get the players
+        white_user, black_user = await self._fetch_players(game)
+
+        # Determine winner
+        if interaction.user.id == game.white_id:
+            winner = black_user
+            winner_color = "Black"
+        else:
+            winner = white_user
+            winner_color = "White"
+
+        # Render final board
+        embed, file = await self.embed_renderer.render_game_embed(
+            game, white_user=white_user, black_user=black_user, bot=self.bot
+        )
+
+        # Send resign text, final board, and PGN as one message
+        pgn = await asyncio.to_thread(game.get_pgn)
+        files = [file] if file else []
+        files.append(discord.File(io.BytesIO(pgn.encode()), filename="game.pgn"))
+
+        await interaction.followup.send(
+            content=f"{interaction.user.mention} has resigned. {winner.mention} ({winner_color}) wins!",
+            embed=embed,
+            files=files
+        )
+
 
     @app_commands.command(name="pgn")
+    @_safe_command
     async def chess_pgn(self, interaction: discord.Interaction):
         """Show the PGN notation of the current game"""
-        try:
-            # Find the current game in this channel
-            game = self.game_manager.get_game_by_channel(interaction.channel_id)
-            
-            if not game:
-                await interaction.response.send_message(
-                    "There is no active chess game in this channel.",
-                    ephemeral=True
-                )
-                return
-            
-            # Get the PGN
-            pgn = game.get_pgn()
-            
-            # Send the PGN
-            await interaction.response.send_message(f"Game PGN:\n```{pgn}```")
-            
-        except Exception as e:
-            logger.error(f"Error showing PGN: {str(e)}")
-            await interaction.response.send_message(f"An error occurred: {format_exception(e)}", ephemeral=True)
+        # Find the current game in this channel; the lookup is a dict hit,
+        # so do it before deferring to keep the error reply ephemeral
+        game = await self._get_channel_game(interaction)
+        if not game:
+            return
+
+        # Acknowledge before generating the PGN so it can't outrun the ACK window
+        await interaction.response.defer()
+
+        # Get the PGN
+        pgn = await asyncio.to_thread(game.get_pgn)
+
+        # Send the PGN as an attachment; long games overflow the
+        # 2000-character message limit as an inline code block
+        await interaction.followup.send(
+            "Game PGN attached:",
+            file=discord.File(io.BytesIO(pgn.encode()), filename="game.pgn")
+        )
+
 
     @app_commands.command(name="suggest")
+    @_safe_command
     async def chess_suggest(self, interaction: discord.Interaction):
         """Get AI suggestions for your next move"""
-        try:
-            # Find the current game in this channel
-            game = self.game_manager.get_game_by_channel(interaction.channel_id)
-            
-            if not game:
-                await interaction.response.send_message(
-                    "There is no active chess game in this channel.",
-                    ephemeral=True
-                )
-                return
-            
-            # Check if it's the player's turn
-            if not game.is_player_turn(interaction.user.id):
-                await interaction.response.send_message(
-                    "It's not your turn. You can only get suggestions on your turn.",
-                    ephemeral=True
-                )
-                return
-            
-            # Acknowledge the command
-            await interaction.response.defer()
-            
-            # Get move suggestions
-            suggestions = game.get_move_suggestions(count=3)
-            
-            if not suggestions:
-                await interaction.followup.send("No move suggestions available.")
-                return
-            
-            # Format suggestions
-            suggestions_text = "Suggested moves:\n"
-            for i, (move, eval_score) in enumerate(suggestions):
-                suggestions_text += f"{i+1}. **{move}** (Evaluation: {eval_score:.2f})\n"
-            
-            await interaction.followup.send(suggestions_text)
-            
-        except Exception as e:
-            logger.error(f"Error suggesting move: {str(e)}")
-            if interaction.response.is_done():
-                await interaction.followup.send(f"An error occurred: {format_exception(e)}")
-            else:
-                await interaction.response.send_message(f"An error occurred: {format_exception(e)}", ephemeral=True)
+        # Find the current game in this channel
+        game = await self._get_channel_game(interaction)
+        if not game:
+            return
+
+        # Check if it's the player's turn
+        if not game.is_player_turn(interaction.user.id):
+            await interaction.response.send_message(
+                "It's not your turn. You can only get suggestions on your turn.",
+                ephemeral=True
+            )
+            return
+
+        # Acknowledge the command
+        await interaction.response.defer()
+
+        # Get move suggestions
+        async with _ENGINE_SEM:
+            suggestions = await asyncio.to_thread(game.get_move_suggestions, 3)
+
+        if not suggestions:
+            await interaction.followup.send("No move suggestions available.")
+            return
+
+        # Format suggestions with a single join instead of += accumulation
+        lines = ["Suggested moves:"]
+        lines.extend(f"{i+1}. **{move}** (Evaluation: {eval_score:.2f})"
+                     for i, (move, eval_score) in enumerate(suggestions))
+
+        await interaction.followup.send("\n".join(lines))
+
 
     @app_commands.command(name="analyze")
+    @_safe_command
     async def chess_analyze(self, interaction: discord.Interaction):
         """Analyze the current board position"""
-        try:
-            # Find the current game in this channel
-            game = self.game_manager.get_game_by_channel(interaction.channel_id)
-            
-            if not game:
-                await interaction.response.send_message(
-                    "There is no active chess game in this channel.",
-                    ephemeral=True
-                )
-                return
-            
-            # Acknowledge the command
-            await interaction.response.defer()
-            
-            # Get move suggestions for analysis
-            suggestions = game.get_move_suggestions(count=3)
-            
-            # Create analysis embed
-            analysis_embed = await self.embed_renderer.render_analysis_embed(game, suggestions)
-            
-            # Send the analysis
-            await interaction.followup.send(embed=analysis_embed)
-            
-        except Exception as e:
-            logger.error(f"Error analyzing position: {str(e)}")
-            if interaction.response.is_done():
-                await interaction.followup.send(f"An error occurred: {format_exception(e)}")
-            else:
-                await interaction.response.send_message(f"An error occurred: {format_exception(e)}", ephemeral=True)
+        # Find the current game in this channel
+        game = await self._get_channel_game(interaction)
+        if not game:
+            return
+
+        # Acknowledge the command
+        await interaction.response.defer()
+
+        # Get move suggestions for analysis
+        async with _ENGINE_SEM:
+            suggestions = await asyncio.to_thread(game.get_move_suggestions, 3)
+
+        # Create analysis embed
+        analysis_embed = await self.embed_renderer.render_analysis_embed(game, suggestions)
+
+        # Send the analysis
+        await interaction.followup.send(embed=analysis_embed)
+
 
     @app_commands.command(name="explain")
+    @_safe_command
     async def chess_explain(self, interaction: discord.Interaction):
         """Get a simple explanation of the current position"""
-        try:
-            # Find the current game in this channel
-            game = self.game_manager.get_game_by_channel(interaction.channel_id)
-            
-            if not game:
-                await interaction.response.send_message(
-                    "There is no active chess game in this channel.",
-                    ephemeral=True
-                )
-                return
-            
-            # Acknowledge the command
-            await interaction.response.defer()
-            
-            # Get the board state
-            board = game.board
-            
-            # Basic position explanation
-            explanation = []
-            
-            # Game phase
-            move_count = len(game.move_history)
-            if move_count < 10:
-                explanation.append("**Opening phase**: Focus on developing pieces, controlling the center, and king safety.")
-            elif move_count < 30:
-                explanation.append("**Middlegame phase**: Focus on creating and executing plans, tactical opportunities, and piece coordination.")
-            else:
-                explanation.append("**Endgame phase**: Focus on pawn promotion, king activity, and simplification if ahead in material.")
-            
-            # Material count
-            white_material = sum(len(list(board.pieces(piece_type, chess.WHITE))) * value 
-                               for piece_type, value in [(chess.PAWN, 1), (chess.KNIGHT, 3), 
-                                                        (chess.BISHOP, 3), (chess.ROOK, 5), 
-                                                        (chess.QUEEN, 9)])
-            
-            black_material = sum(len(list(board.pieces(piece_type, chess.BLACK))) * value 
-                               for piece_type, value in [(chess.PAWN, 1), (chess.KNIGHT, 3), 
-                                                        (chess.BISHOP, 3), (chess.ROOK, 5), 
-                                                        (chess.QUEEN, 9)])
-            
-            material_diff = white_material - black_material
-            if material_diff > 2:
-                explanation.append(f"**Material**: White is ahead by {material_diff} points.")
-            elif material_diff < -2:
-                explanation.append(f"**Material**: Black is ahead by {abs(material_diff)} points.")
-            else:
-                explanation.append("**Material**: Material is roughly equal.")
-            
-            # King safety
-            white_king_square = board.king(chess.WHITE)
-            black_king_square = board.king(chess.BLACK)
-            white_king_attackers = len(list(board.attackers(chess.BLACK, white_king_square))) if white_king_square else 0
-            black_king_attackers = len(list(board.attackers(chess.WHITE, black_king_square))) if black_king_square else 0
-            
-            if white_king_attackers > 0:
-                explanation.append(f"**King Safety**: White's king is under attack by {white_king_attackers} piece(s).")
-            if black_king_attackers > 0:
-                explanation.append(f"**King Safety**: Black's king is under attack by {black_king_attackers} piece(s).")
-            
-            # Mobility
-            if board.turn:
-                # White to move
-                mobility = len(list(board.legal_moves))
-                if mobility > 30:
-                    explanation.append(f"**Mobility**: White has many options ({mobility} legal moves).")
-                elif mobility < 10:
-                    explanation.append(f"**Mobility**: White has limited options (only {mobility} legal moves).")
-            else:
-                # Black to move
-                mobility = len(list(board.legal_moves))
-                if mobility > 30:
-                    explanation.append(f"**Mobility**: Black has many options ({mobility} legal moves).")
-                elif mobility < 10:
-                    explanation.append(f"**Mobility**: Black has limited options (only {mobility} legal moves).")
-            
-            # Pawn structure
-            white_pawns = list(board.pieces(chess.PAWN, chess.WHITE))
-            black_pawns = list(board.pieces(chess.PAWN, chess.BLACK))
-            
-            white_pawn_files = [chess.square_file(square) for square in white_pawns]
-            black_pawn_files = [chess.square_file(square) for square in black_pawns]
-            
-            # Count doubled pawns
-            white_doubled = len(white_pawn_files) - len(set(white_pawn_files))
-            black_doubled = len(black_pawn_files) - len(set(black_pawn_files))
-            
-            if white_doubled > 0:
-                explanation.append(f"**Pawn Structure**: White has {white_doubled} doubled pawn(s).")
-            if black_doubled > 0:
-                explanation.append(f"**Pawn Structure**: Black has {black_doubled} doubled pawn(s).")
-            
-            # Send the explanation
-            await interaction.followup.send("**Position Analysis**\n\n" + "\n".join(explanation))
-            
-        except Exception as e:
-            logger.error(f"Error explaining position: {str(e)}")
-            if interaction.response.is_done():
-                await interaction.followup.send(f"An error occurred: {format_exception(e)}")
-            else:
-                await interaction.response.send_message(f"An error occurred: {format_exception(e)}", ephemeral=True)
+        # Find the current game in this channel
+        game = await self._get_channel_game(interaction)
+        if not game:
+            return
+
+        # Acknowledge the command
+        await interaction.response.defer()
+
+        # Snapshot the state the analysis needs, then run the chess-heavy
+        # part in a worker thread so the event loop stays responsive
+        stats = getattr(game, "stats", None)
+        material = (stats.white_material, stats.black_material) if stats is not None else None
+        async with _ENGINE_SEM:
+            text = await asyncio.to_thread(
+                _explain_position, game.board.fen(), len(game.move_history), material
+            )
+
+        # Send the explanation
+        await interaction.followup.send(text)
+
+
+# Static explanation text, built once at import time
+_PHASE_STRINGS = (
+    "**Opening phase**: Focus on developing pieces, controlling the center, and king safety.",
+    "**Middlegame phase**: Focus on creating and executing plans, tactical opportunities, and piece coordination.",
+    "**Endgame phase**: Focus on pawn promotion, king activity, and simplification if ahead in material.",
+)
+_PHASE_BOUNDS = (10, 30)  # move counts where the phase labels change
+_MATERIAL_EQUAL = "**Material**: Material is roughly equal."
+
+
+def _explain_position(fen: str, move_count: int, material: Optional[Tuple[int, int]]) -> str:
+    """Build the position explanation from a FEN snapshot (runs off-loop)"""
+    board = chess.Board(fen)
+
+    explanation = []
+
+    # Game phase
+    explanation.append(_PHASE_STRINGS[bisect.bisect_right(_PHASE_BOUNDS, move_count)])
+
+    # Material count from the incrementally maintained game stats,
+    # falling back to a bitboard scan if the game has none
+    if material is not None:
+        white_material, black_material = material
+    else:
+        white_material = _material(board, chess.WHITE)
+        black_material = _material(board, chess.BLACK)
+
+    material_diff = white_material - black_material
+    if material_diff > 2:
+        explanation.append(f"**Material**: White is ahead by {material_diff} points.")
+    elif material_diff < -2:
+        explanation.append(f"**Material**: Black is ahead by {abs(material_diff)} points.")
+    else:
+        explanation.append(_MATERIAL_EQUAL)
+
+    # King safety
+    white_king_square = board.king(chess.WHITE)
+    black_king_square = board.king(chess.BLACK)
+    white_king_attackers = board.attackers_mask(chess.BLACK, white_king_square).bit_count() if white_king_square is not None else 0
+    black_king_attackers = board.attackers_mask(chess.WHITE, black_king_square).bit_count() if black_king_square is not None else 0
+
+    if white_king_attackers > 0:
+        explanation.append(f"**King Safety**: White's king is under attack by {white_king_attackers} piece(s).")
+    if black_king_attackers > 0:
+        explanation.append(f"**King Safety**: Black's king is under attack by {black_king_attackers} piece(s).")
+
+    # Mobility: only count far enough to pick the bucket, since move
+    # generation is the most expensive chess call here
+    side = "White" if board.turn else "Black"
+    mobility = _bounded_count(board.legal_moves, 30)
+    if mobility > 30:
+        explanation.append(f"**Mobility**: {side} has many options (30+ legal moves).")
+    elif mobility < 10:
+        explanation.append(f"**Mobility**: {side} has limited options (only {mobility} legal moves).")
+
+    # Pawn structure: count doubled pawns by masking the pawn
+    # bitboard against each file (8 ANDs + popcounts, no lists/sets)
+    white_pawn_mask = board.pieces_mask(chess.PAWN, chess.WHITE)
+    black_pawn_mask = board.pieces_mask(chess.PAWN, chess.BLACK)
+
+    white_doubled = sum(max(0, (white_pawn_mask & file_mask).bit_count() - 1)
+                        for file_mask in chess.BB_FILES)
+    black_doubled = sum(max(0, (black_pawn_mask & file_mask).bit_count() - 1)
+                        for file_mask in chess.BB_FILES)
+
+    if white_doubled > 0:
+        explanation.append(f"**Pawn Structure**: White has {white_doubled} doubled pawn(s).")
+    if black_doubled > 0:
+        explanation.append(f"**Pawn Structure**: Black has {black_doubled} doubled pawn(s).")
+
+    return "**Position Analysis**\n\n" + "\n".join(explanation)
+
 
 async def setup(bot: commands.Bot):
     """Setup function for loading the cog"""
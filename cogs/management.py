@@ -2,6 +2,7 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
+import datetime
 import traceback
 from typing import Optional, Literal
 
@@ -50,7 +51,6 @@ class Management(commands.Cog):
         embed.add_field(name="Latency", value=f"{round(self.bot.latency * 1000)}ms", inline=True)
         
         # Get uptime
-        import datetime
         uptime = datetime.datetime.now() - datetime.datetime.fromtimestamp(self.bot.uptime)
         hours, remainder = divmod(int(uptime.total_seconds()), 3600)
         minutes, seconds = divmod(remainder, 60)
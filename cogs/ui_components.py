@@ -7,12 +7,30 @@ from typing import Optional, Callable, Any, Coroutine
 class ChallengeButtons(ui.View):
     """View with buttons for chess challenge responses"""
     
-    def __init__(self, challenger, challenged, timeout=300):
+    def __init__(self, challenger, challenged, timeout=330):
+        # Expiry is driven centrally by the cog's challenge expiry worker
+        # calling expire() at the 5-minute mark; the slightly longer view
+        # timeout is only a backstop so wait_response can never hang if
+        # the worker misses this view (e.g. the cog is unloaded)
         super().__init__(timeout=timeout)
         self.challenger = challenger
         self.challenged = challenged
         self.response = None
-    
+        self._response_future = asyncio.get_event_loop().create_future()
+
+    def _resolve(self, response: Optional[bool]):
+        """Record the response and resolve the waiting future exactly once"""
+        self.response = response
+        if not self._response_future.done():
+            self._response_future.set_result(response)
+
+    async def wait_response(self) -> Optional[bool]:
+        """Wait for the challenge response directly via the future
+
+        Returns True if accepted, False if declined, None if the view timed out.
+        """
+        return await self._response_future
+
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         """Check if the interacting user is the challenged player"""
         if interaction.user.id != self.challenged.id:
@@ -26,18 +44,24 @@ class ChallengeButtons(ui.View):
     @ui.button(label="Accept", style=discord.ButtonStyle.green, emoji="✅")
     async def accept_button(self, interaction: discord.Interaction, button: ui.Button):
         """Accept the challenge"""
-        self.response = True
+        # Acknowledge within Discord's 3s window before any bookkeeping
+        await interaction.response.defer(thinking=False)
+        self._resolve(True)
         self.stop()
-        await interaction.response.defer()
-    
+
     @ui.button(label="Decline", style=discord.ButtonStyle.red, emoji="❌")
     async def decline_button(self, interaction: discord.Interaction, button: ui.Button):
         """Decline the challenge"""
-        self.response = False
+        await interaction.response.defer(thinking=False)
+        self._resolve(False)
         self.stop()
-        await interaction.response.defer()
-    
+
+    def expire(self):
+        """Expire the challenge, resolving any waiter with None"""
+        self._resolve(None)
+        self.stop()
+
     async def on_timeout(self):
-        """Handle view timeout"""
-        self.response = None
+        """Handle view timeout (only when a timeout is explicitly set)"""
+        self._resolve(None)
         self.stop()
@@ -2,81 +2,102 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import asyncio
-import os
-from dotenv import load_dotenv
 import logging
 import sys
 import traceback
 import time
 from typing import Dict, List, Optional
 
-from utils import setup_logging, logger
+from utils import CONFIG, logger
 
-# Load environment variables
-load_dotenv()
-TOKEN = os.getenv("DISCORD_TOKEN")
-AI_DIFFICULTY = int(os.getenv("AI_DIFFICULTY", 5))
+# Environment configuration is loaded exactly once in utils.CONFIG
+TOKEN = CONFIG.token
 
 # Verify token is available
 if not TOKEN:
     logger.critical("No Discord token found in .env file. Please add your bot token as DISCORD_TOKEN=your_token")
     sys.exit(1)
 
-# Configure bot with intents
+# Configure bot with intents. Game commands are all slash commands, so
+# the privileged members intent (and the member chunk it forces on every
+# guild at connect) is unnecessary; message_content stays on only for
+# the owner-only prefix commands in cogs/management.py.
 intents = discord.Intents.default()
-intents.message_content = True  # Needed to read message content
-intents.members = True  # Needed to access member information
-
-# Create bot instance
-bot = commands.Bot(command_prefix="!", intents=intents, help_command=None)
-bot.uptime = time.time()  # Track when the bot started
+intents.message_content = True  # Needed for the owner-only ! commands
+intents.members = False
 
 initial_extensions = [
     'cogs.chess_commands',
     'cogs.management'
 ]
 
+class ChessBot(commands.Bot):
+    async def setup_hook(self):
+        """One-time async setup; unlike on_ready this never re-runs on reconnect"""
+        # Eager tasks (3.12+) run new coroutines inline until their first
+        # real suspension, skipping a loop iteration for the many short
+        # ones the bot spawns per interaction
+        if sys.version_info >= (3, 12):
+            asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
+        await load_extensions()
+
+# Create bot instance; passing activity here sends the presence once in
+# the IDENTIFY payload instead of a separate gateway frame per READY
+_ACTIVITY = discord.Game(name="Chess | /chess help")
+bot = ChessBot(
+    command_prefix="!",
+    intents=intents,
+    help_command=None,
+    activity=_ACTIVITY,
+    chunk_guilds_at_startup=False,
+    member_cache_flags=discord.MemberCacheFlags.none(),
+)
+bot.uptime = time.time()  # Track when the bot started
+
 @bot.event
 async def on_ready():
     """Called when the bot is ready"""
     logger.info(f"Logged in as {bot.user.name} ({bot.user.id})")
     logger.info(f"Connected to {len(bot.guilds)} guilds")
-    
-    # Set bot activity
-    await bot.change_presence(
-        activity=discord.Game(name="Chess | /chess help")
-    )
-    
+
+    # Presence is set via the activity kwarg at IDENTIFY; only resend it
+    # if something cleared it since
+    if bot.activity != _ACTIVITY:
+        await bot.change_presence(activity=_ACTIVITY)
+
     logger.info("ChessBot is ready!")
 
+# Response templates, parsed once instead of per error
+_COOLDOWN_MSG = "This command is on cooldown. Try again in {:.2f} seconds."
+_ERROR_MSG = "Error executing command: {}"
+
 @bot.tree.error
 async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
     """Handle slash command errors"""
     if isinstance(error, app_commands.CommandOnCooldown):
         await interaction.response.send_message(
-            f"This command is on cooldown. Try again in {error.retry_after:.2f} seconds.", 
+            _COOLDOWN_MSG.format(error.retry_after),
             ephemeral=True
         )
         return
-    
+
     if isinstance(error, app_commands.MissingPermissions):
         await interaction.response.send_message(
-            "You don't have permission to use this command.", 
+            "You don't have permission to use this command.",
             ephemeral=True
         )
         return
-    
-    # Log unexpected errors
-    logger.error(f"Command error in {interaction.command}: {str(error)}")
-    logger.error(''.join(traceback.format_exception(type(error), error, error.__traceback__)))
-    
+
+    # Log unexpected errors; the traceback is only rendered if a handler
+    # actually emits the record
+    logger.error("Command error in %s: %s", interaction.command, error, exc_info=error)
+
     # Notify user
     error_message = str(error) or "An unknown error occurred"
+    sender = interaction.followup.send if interaction.response.is_done() else interaction.response.send_message
     try:
-        if interaction.response.is_done():
-            await interaction.followup.send(f"Error executing command: {error_message}", ephemeral=True)
-        else:
-            await interaction.response.send_message(f"Error executing command: {error_message}", ephemeral=True)
+        await sender(_ERROR_MSG.format(error_message), ephemeral=True)
     except Exception as e:
         logger.error(f"Failed to send error message: {e}")
 
@@ -92,13 +113,18 @@ async def load_extensions():
 
 def run_bot():
     """Run the bot"""
-    async def startup():
-        await load_extensions()
-        await bot.start(TOKEN)
-        
+    # Prefer uvloop's libuv-backed event loop when it's available; it cuts
+    # per-callback overhead on every await. Unavailable on Windows.
+    try:
+        import uvloop
+        uvloop.install()
+        logger.info("Using uvloop event loop")
+    except ImportError:
+        logger.debug("uvloop not available, using default event loop")
+
     try:
         logger.info("Starting ChessBot...")
-        asyncio.run(startup())
+        asyncio.run(bot.start(TOKEN))
     except discord.errors.LoginFailure:
         logger.critical("Invalid Discord token. Please check your .env file.")
         sys.exit(1)
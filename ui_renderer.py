@@ -61,7 +61,7 @@ class BoardRenderer:
                 logger.warning("Using default font as no system fonts were found")
                 
         except Exception as e:
-            logger.error(f"Error loading font: {str(e)}")
+            logger.error("Error loading font: %s", e, exc_info=True)
             self.font = ImageFont.load_default()
     
     def _load_piece_images(self):
@@ -116,7 +116,7 @@ class BoardRenderer:
             logger.info("Generated piece images")
             
         except Exception as e:
-            logger.error(f"Error loading piece images: {str(e)}")
+            logger.error("Error loading piece images: %s", e, exc_info=True)
     
     def _get_square_color(self, rank: int, file: int) -> Tuple[int, int, int]:
         """Get the color for a square at the given rank and file"""
@@ -223,6 +223,8 @@ class ChessEmbedRenderer:
     def __init__(self):
         """Initialize the embed renderer"""
         self.board_renderer = BoardRenderer()
+        self._help_embed = None  # Built once, the help text never changes
+        self._starting_png = None  # Shared PNG of the starting position
     
     async def render_game_embed(
         self, 
@@ -233,18 +235,27 @@ class ChessEmbedRenderer:
     ) -> Tuple[discord.Embed, Optional[discord.File]]:
         """Render a chess game as a Discord embed with an image"""
         try:
-            # Get users if they're not provided
-            if bot and not white_user and game.white_id > 0:
+            # Get users if they're not provided, fetching both concurrently
+            # when neither was passed in
+            async def fetch_or_none(user_id):
                 try:
-                    white_user = await bot.fetch_user(game.white_id)
+                    return await bot.fetch_user(user_id)
                 except Exception:
-                    white_user = None
-                    
-            if bot and not black_user and game.black_id > 0:
-                try:
-                    black_user = await bot.fetch_user(game.black_id)
-                except Exception:
-                    black_user = None
+                    return None
+
+            if bot:
+                need_white = not white_user and game.white_id > 0
+                need_black = not black_user and game.black_id > 0
+
+                if need_white and need_black:
+                    white_user, black_user = await asyncio.gather(
+                        fetch_or_none(game.white_id),
+                        fetch_or_none(game.black_id)
+                    )
+                elif need_white:
+                    white_user = await fetch_or_none(game.white_id)
+                elif need_black:
+                    black_user = await fetch_or_none(game.black_id)
             
             # Determine player names
             white_name = white_user.display_name if white_user else f"Player {game.white_id}"
@@ -258,9 +269,26 @@ class ChessEmbedRenderer:
                 except Exception:
                     pass
             
-            # Get board image
-            board_image = self.board_renderer.get_board_image(game.board, last_move)
-            board_file = discord.File(board_image, filename="board.png")
+            # Get board image, reusing the cached PNG if the position hasn't
+            # changed since the last render (e.g. repeated /chess board calls)
+            fen = game.board.fen()
+            cached = getattr(game, "board_png_cache", None)
+            if cached and cached[0] == fen:
+                png_bytes = cached[1]
+            elif fen == chess.STARTING_FEN and self._starting_png is not None:
+                # Every game opens from the same position, so the first game's
+                # render is reused for all subsequent game starts
+                png_bytes = self._starting_png
+            else:
+                # Pillow work is CPU-bound; run it off the event loop so other
+                # commands aren't stalled behind the render
+                buffer = await asyncio.to_thread(self.board_renderer.get_board_image, game.board, last_move)
+                png_bytes = buffer.getvalue()
+                game.board_png_cache = (fen, png_bytes)
+                if fen == chess.STARTING_FEN:
+                    self._starting_png = png_bytes
+
+            board_file = discord.File(io.BytesIO(png_bytes), filename="board.png")
             
             # Create embed
             embed = discord.Embed(title="Chess Game", color=0x2f3136)
@@ -316,7 +344,7 @@ class ChessEmbedRenderer:
             return embed, board_file
             
         except Exception as e:
-            logger.error(f"Error rendering game embed: {str(e)}")
+            logger.error("Error rendering game embed: %s", e, exc_info=True)
             # Return a simple error embed
             embed = discord.Embed(
                 title="Chess Game", 
@@ -346,6 +374,10 @@ class ChessEmbedRenderer:
     
     async def render_help_embed(self) -> discord.Embed:
         """Render the help information as a Discord embed"""
+        # The help embed is static, so build it once and reuse it
+        if self._help_embed is not None:
+            return self._help_embed
+
         embed = discord.Embed(
             title="ChessBot Help", 
             description="Commands and instructions for playing chess", 
@@ -381,7 +413,8 @@ class ChessEmbedRenderer:
         embed.add_field(name="Making Moves", value=move_help, inline=False)
         
         embed.set_footer(text="ChessBot | Build 1.0")
-        
+
+        self._help_embed = embed
         return embed
 
     async def render_analysis_embed(self, game, suggestions: List[Tuple[str, float]]) -> discord.Embed:
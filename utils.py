@@ -1,20 +1,78 @@
 
 import os
+import atexit
 import logging
+import logging.handlers
 import colorlog
 import json
-from datetime import datetime
+import queue
+import random
+import time
+import types
+from dataclasses import dataclass
 import asyncio
-from typing import Dict, Any, Optional, Callable, Coroutine
+from typing import Dict, Any, Optional, Callable, Coroutine, Tuple
+
+import discord
+from dotenv import load_dotenv
+
+# Runtime configuration, read from the environment exactly once
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Immutable snapshot of the bot's environment configuration"""
+    token: Optional[str]
+    ai_difficulty: int
+    log_level: str
+
+    @classmethod
+    def from_env(cls) -> "Config":
+        load_dotenv()
+        return cls(
+            token=os.getenv("DISCORD_TOKEN"),
+            ai_difficulty=int(os.getenv("AI_DIFFICULTY", 5)),
+            log_level=os.getenv("LOG_LEVEL", "INFO"),
+        )
+
+CONFIG = Config.from_env()
 
 # Configure logging with color formatting
-def setup_logging():
-    """Set up logging with color formatting and appropriate level from environment"""
-    log_level = os.getenv("LOG_LEVEL", "INFO")
-    
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that reuses the rendered timestamp within the same second
+
+    strftime dominates the cost of formatting a record; with a
+    seconds-resolution datefmt every record in the same second renders
+    the same string, so cache it.
+    """
+
+    _time_cache = (None, "")
+
+    def formatTime(self, record, datefmt=None):
+        when = int(record.created)
+        if self._time_cache[0] != when:
+            self._time_cache = (when, super().formatTime(record, datefmt))
+        return self._time_cache[1]
+
+class _CachedTimeColoredFormatter(_CachedTimeFormatter, colorlog.ColoredFormatter):
+    pass
+
+def setup_logging(config: Config = CONFIG):
+    """Set up logging with color formatting and the level from the config"""
+    logger = logging.getLogger('chessbot')
+    if logger.handlers:
+        # Already configured; attaching again would duplicate every record
+        return logger
+
+    log_level = config.log_level
+
+    # The bot never logs thread/process names, so skip collecting them
+    # for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     handler = colorlog.StreamHandler()
     handler.setFormatter(
-        colorlog.ColoredFormatter(
+        _CachedTimeColoredFormatter(
             "%(log_color)s%(asctime)s - %(levelname)s - %(name)s - %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S",
             log_colors={
@@ -27,68 +85,169 @@ def setup_logging():
         )
     )
     
-    logger = logging.getLogger('chessbot')
-    logger.setLevel(getattr(logging, log_level))
-    logger.addHandler(handler)
-    
     # Also create a file handler for persistent logging
     file_handler = logging.FileHandler("chessbot.log")
-    file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s"))
-    logger.addHandler(file_handler)
-    
+    file_handler.setFormatter(
+        _CachedTimeFormatter(
+            "%(asctime)s - %(levelname)s - %(name)s - %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+    )
+
+    # Hand records to a background thread so logging calls on the event
+    # loop never block on terminal or disk writes
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, handler, file_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    logger.setLevel(getattr(logging, log_level))
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    # Don't bubble records up to the root logger, which discord.py
+    # configures with its own handlers
+    logger.propagate = False
+
     return logger
 
 logger = setup_logging()
 
 # Game data persistence
 class GameStorage:
-    """Handles persistence of game data between bot restarts"""
-    
-    def __init__(self, filename="games.json"):
+    """Handles persistence of game data between bot restarts
+
+    Mutations mark the store dirty; when the flush loop is running,
+    writes are debounced and happen off the event loop. Without a
+    running loop, mutations fall back to an immediate synchronous save.
+    """
+
+    def __init__(self, filename="games.jsonl", flush_interval=2.0):
         self.filename = filename
+        self.flush_interval = flush_interval
         self.games = {}
+        self._dirty = False
+        self._flush_task = None
+        self._pending_ops = []  # Serialized change records awaiting append
+        self._log_records = 0  # Records currently in the on-disk log
         self.load()
-    
+
     def load(self):
-        """Load game data from disk"""
+        """Load game data by replaying the change log"""
         try:
             if os.path.exists(self.filename):
                 with open(self.filename, 'r') as f:
-                    self.games = json.load(f)
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        record = json.loads(line)
+                        if record["op"] == "put":
+                            self.games[record["id"]] = record["data"]
+                        elif record["op"] == "del":
+                            self.games.pop(record["id"], None)
+                        self._log_records += 1
                 logger.info(f"Loaded {len(self.games)} games from storage")
             else:
                 logger.info("No game storage file found, starting fresh")
         except Exception as e:
-            logger.error(f"Error loading game data: {str(e)}")
+            logger.error("Error loading game data: %s", e, exc_info=True)
             self.games = {}
-    
+
     def save(self):
-        """Save game data to disk"""
+        """Save pending changes to disk immediately"""
         try:
-            with open(self.filename, 'w') as f:
-                json.dump(self.games, f)
+            self._write_to_disk()
+            self._dirty = False
             logger.info(f"Saved {len(self.games)} games to storage")
         except Exception as e:
-            logger.error(f"Error saving game data: {str(e)}")
-    
+            logger.error("Error saving game data: %s", e, exc_info=True)
+
+    def _write_to_disk(self):
+        """Append pending change records, compacting when the log is bloated"""
+        ops, self._pending_ops = self._pending_ops, []
+
+        # Compact once deletions/overwrites make the log much larger than
+        # the live game set; otherwise a single append moves only the
+        # bytes that actually changed
+        if self._log_records + len(ops) > max(64, 2 * len(self.games)):
+            self._compact()
+            return
+
+        try:
+            with open(self.filename, 'a') as f:
+                f.write("".join(op + "\n" for op in ops))
+        except Exception:
+            self._pending_ops = ops + self._pending_ops
+            raise
+        self._log_records += len(ops)
+
+    def _compact(self):
+        """Rewrite the log with one put record per live game, atomically"""
+        tmp_filename = f"{self.filename}.tmp"
+        with open(tmp_filename, 'w') as f:
+            for game_id, game_data in self.games.items():
+                f.write(json.dumps({"op": "put", "id": game_id, "data": game_data}) + "\n")
+        os.replace(tmp_filename, self.filename)
+        self._log_records = len(self.games)
+
+    def _record_op(self, op):
+        """Queue a change record, saving now if no flush loop is running"""
+        self._pending_ops.append(json.dumps(op))
+        self._dirty = True
+        if self._flush_task is None:
+            self.save()
+
+    def start_flushing(self):
+        """Start the debounced background writer (call from a running loop)"""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    def stop_flushing(self):
+        """Stop the background writer, saving any pending changes"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._dirty:
+            self.save()
+
+    async def _flush_loop(self):
+        """Write dirty state to disk at most once per interval, off-loop"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if not self._dirty:
+                continue
+            self._dirty = False
+            try:
+                await asyncio.to_thread(self._write_to_disk)
+            except Exception as e:
+                logger.error("Error flushing game data: %s", e, exc_info=True)
+                self._dirty = True  # Retry on the next tick
+
     def add_game(self, game_id, game_data):
         """Add or update a game in storage"""
+        if self.games.get(game_id) == game_data:
+            return  # Identical payload; skip the log record entirely
         self.games[game_id] = game_data
-        self.save()
-    
+        self._record_op({"op": "put", "id": game_id, "data": game_data})
+
     def get_game(self, game_id):
         """Retrieve a game from storage"""
         return self.games.get(game_id)
-    
+
     def remove_game(self, game_id):
         """Remove a game from storage"""
         if game_id in self.games:
             del self.games[game_id]
-            self.save()
+            self._record_op({"op": "del", "id": game_id})
     
     def get_all_games(self):
-        """Get all stored games"""
-        return self.games
+        """Get a read-only view of all stored games
+
+        A mapping proxy costs nothing to build and keeps callers from
+        mutating games behind the change log's back.
+        """
+        return types.MappingProxyType(self.games)
 
 # Discord interaction helpers
 async def send_with_retry(send_func: Callable[..., Coroutine], *args, **kwargs) -> Optional[Any]:
@@ -99,10 +258,22 @@ async def send_with_retry(send_func: Callable[..., Coroutine], *args, **kwargs)
     for attempt in range(max_retries):
         try:
             return await send_func(*args, **kwargs)
+        except (discord.NotFound, discord.Forbidden) as e:
+            # Deleted target or missing permissions won't fix themselves;
+            # retrying only burns the backoff delay
+            logger.error(f"Message send failed permanently: {str(e)}")
+            return None
         except Exception as e:
             if attempt < max_retries - 1:
-                wait_time = backoff_factor ** attempt
-                logger.warning(f"Message send failed, retrying in {wait_time}s: {str(e)}")
+                retry_after = getattr(e, "retry_after", None)
+                if retry_after:
+                    # Discord told us exactly how long to wait on a 429
+                    wait_time = retry_after
+                else:
+                    wait_time = backoff_factor ** attempt
+                # Jitter so simultaneous failures don't all retry at once
+                wait_time *= random.uniform(0.8, 1.2)
+                logger.warning(f"Message send failed, retrying in {wait_time:.1f}s: {str(e)}")
                 await asyncio.sleep(wait_time)
             else:
                 logger.error(f"Failed to send message after {max_retries} attempts: {str(e)}")
@@ -118,29 +289,52 @@ class CooldownManager:
     """Manages command cooldowns to prevent spam"""
     
     def __init__(self):
+        # (user_id, command) -> (last_call_monotonic, cooldown_seconds)
         self.cooldowns = {}
-    
+
     def is_on_cooldown(self, user_id: int, command: str, cooldown_seconds: int) -> bool:
         """Check if a user is on cooldown for a command"""
-        key = f"{user_id}:{command}"
-        now = datetime.now().timestamp()
-        
-        if key in self.cooldowns:
-            if now - self.cooldowns[key] < cooldown_seconds:
-                return True
-        
-        self.cooldowns[key] = now
+        key = (user_id, command)
+        now = time.monotonic()
+
+        entry = self.cooldowns.get(key)
+        if entry is not None and now - entry[0] < cooldown_seconds:
+            return True
+
+        self.cooldowns[key] = (now, cooldown_seconds)
         return False
 
+    def check_and_set(self, user_id: int, command: str, cooldown_seconds: int) -> Tuple[bool, float]:
+        """Check and start a cooldown with a single dict lookup
+
+        Returns (on_cooldown, remaining_seconds); starts the cooldown when the
+        user is not currently limited.
+        """
+        key = (user_id, command)
+        now = time.monotonic()
+
+        entry = self.cooldowns.get(key)
+        if entry is not None:
+            remaining = cooldown_seconds - (now - entry[0])
+            if remaining > 0:
+                return True, remaining
+
+        self.cooldowns[key] = (now, cooldown_seconds)
+        return False, 0.0
+
+    def prune(self, max_age: float = 3600) -> int:
+        """Drop cooldown entries older than max_age seconds"""
+        now = time.monotonic()
+        stale = [key for key, entry in self.cooldowns.items() if now - entry[0] > max_age]
+        for key in stale:
+            del self.cooldowns[key]
+        return len(stale)
+
     def get_remaining_cooldown(self, user_id: int, command: str) -> float:
         """Get the remaining cooldown time in seconds"""
-        key = f"{user_id}:{command}"
-        now = datetime.now().timestamp()
-        
-        if key in self.cooldowns:
-            elapsed = now - self.cooldowns[key]
-            cooldown = self.cooldowns.get(f"{command}_time", 3)  # Default 3 seconds
-            remaining = cooldown - elapsed
-            return max(0, remaining)
-        
+        entry = self.cooldowns.get((user_id, command))
+        if entry is not None:
+            last, cooldown_seconds = entry
+            return max(0, cooldown_seconds - (time.monotonic() - last))
+
         return 0